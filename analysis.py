@@ -1,8 +1,13 @@
 # importing libraries
 import numpy as np
-from scipy.stats import chi2, ttest_1samp
+import pandas as pd
+from scipy.stats import chi2, t, ttest_1samp
 from scipy.special import erf
 
+# expected periods in hours
+SOLAR_DAY    = 24.0
+SIDEREAL_DAY = 23 + 56/60
+
 # declaring the Analysis class
 # this class is used to perform the analysis on the data
 class Analysis:
@@ -17,32 +22,58 @@ class Analysis:
         P = p * len(d)
         return list(zip(d, P))
 
+    # this function is used to bin a time series by summing its values
+    # it works on the time array sorted once and only touches occupied
+    # bins, so memory does not grow with the time span of the data
+    # it takes the time and value arrays as input and returns the sorted
+    # bin starts and the sum of the values in every bin
+    def bin_sorted(self, time, value, bin_width: float):
+        time  = np.asarray(time)
+        value = np.asarray(value)
+        if len(time) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=value.dtype)
+        if np.any(time[1:] < time[:-1]):
+            order = np.argsort(time, kind='stable')
+            time, value = time[order], value[order]
+        b = ((time // bin_width) * bin_width).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+        return b[starts], np.add.reduceat(value, starts)
+
+    # this function is used to merge two binned series onto their common bins
+    # the union costs O(k log k) in the k occupied bins, whatever the time
+    # span; a bin missing from one series counts zero there
+    # it returns the common bins and both series aligned to them
+    def merge_bins(self, bins1, sums1, bins2, sums2):
+        all_bins = np.union1d(bins1, bins2)
+        s1 = np.zeros(len(all_bins), dtype=np.result_type(sums1, float))
+        s2 = np.zeros(len(all_bins), dtype=np.result_type(sums2, float))
+        s1[np.searchsorted(all_bins, bins1)] = sums1
+        s2[np.searchsorted(all_bins, bins2)] = sums2
+        return all_bins, s1, s2
+
     # this function is used to calculate the chi-square analysis
     # it takes two dataframes as input and returns the chi-square analysis
     def chi_square_analysis(self, df1, df2,
                             bin_width: float,
                             time_column='time',
                             value_column='value'):
-        import pandas as pd
-
         # binning the data
-        def bin_data(df):
-            b = ((df[time_column] // bin_width) * bin_width).astype(int)
-            return df.groupby(b)[value_column].sum()
-
-        b1 = bin_data(df1)
-        b2 = bin_data(df2)
-        all_bins = b1.index.union(b2.index)
-        b1 = b1.reindex(all_bins, fill_value=0)
-        b2 = b2.reindex(all_bins, fill_value=0)
+        bins1, sums1 = self.bin_sorted(df1[time_column].to_numpy(),
+                                       df1[value_column].to_numpy(), bin_width)
+        bins2, sums2 = self.bin_sorted(df2[time_column].to_numpy(),
+                                       df2[value_column].to_numpy(), bin_width)
+        all_bins, b1, b2 = self.merge_bins(bins1, sums1, bins2, sums2)
 
         T1, T2 = b1.sum(), b2.sum()
         Tot = T1 + T2
-        E1 = (b1 + b2) * (T1 / Tot)
-        E2 = (b1 + b2) * (T2 / Tot)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            E1 = (b1 + b2) * (T1 / Tot)
+            E2 = (b1 + b2) * (T2 / Tot)
+            d1 = (b1 - E1)**2 / E1
+            d2 = (b2 - E2)**2 / E2
 
-        χ2_1 = ((b1 - E1)**2 / E1).replace([np.inf, np.nan], 0).sum()
-        χ2_2 = ((b2 - E2)**2 / E2).replace([np.inf, np.nan], 0).sum()
+        χ2_1 = d1[np.isfinite(d1)].sum()
+        χ2_2 = d2[np.isfinite(d2)].sum()
         χ2_tot = χ2_1 + χ2_2
 
         ν = len(all_bins) - 1
@@ -50,10 +81,10 @@ class Analysis:
 
         table = pd.DataFrame({
             'Time Bin': all_bins,
-            'Obs1': b1.values,
-            'Obs2': b2.values,
-            'Exp1': E1.values,
-            'Exp2': E2.values
+            'Obs1': b1,
+            'Obs2': b2,
+            'Exp1': E1,
+            'Exp2': E2
         })
         return {
             'table': table,
@@ -70,3 +101,87 @@ class Analysis:
         tstat, p = ttest_1samp(data, popmean)
         conclusion = "reject H₀" if p < 0.05 else "fail to reject H₀"
         return {'tstat': tstat, 'pvalue': p, 'conclusion': conclusion}
+
+    # this function is used to test the measured period of every session
+    # against its expected period in one vectorized computation
+    # sessions maps a dataset name to its (time, angle) arrays; expected maps
+    # a name to its expected period in hours (by default 24 h for names
+    # starting with "Solar" and 23 h 56 m otherwise)
+    # each session is fitted with θ = a0 + ω·t by least squares, giving
+    # t₀ = 2π/ω ± δt₀ and t = (t₀ - expected)/δt₀ with n-2 degrees of freedom;
+    # the p-values are corrected for the number of sessions tested
+    # ("holm", "bonferroni", "bh" for Benjamini-Hochberg, or None)
+    # it returns a DataFrame with one row per session
+    def period_t_tests(self, sessions: dict,
+                       expected: dict = None,
+                       correction: str = "holm",
+                       alpha: float = 0.05):
+        names = list(sessions)
+        if expected is None:
+            expected = {}
+        exp = np.array([expected.get(k, SOLAR_DAY if k.startswith("Solar") else SIDEREAL_DAY)
+                        for k in names], dtype=float)
+
+        # all sessions in one flat array, seg holds the session of every point
+        n   = np.array([len(sessions[k][0]) for k in names])
+        x   = np.concatenate([np.asarray(sessions[k][0], dtype=float) for k in names])
+        y   = np.concatenate([np.asarray(sessions[k][1], dtype=float) for k in names])
+        seg = np.repeat(np.arange(len(names)), n)
+        sums = lambda w: np.bincount(seg, weights=w, minlength=len(names))
+
+        # least squares slope and its standard error per session
+        # sessions with fewer than three points give NaN
+        dof = n - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xm, ym = sums(x) / n, sums(y) / n
+            xc, yc = x - xm[seg], y - ym[seg]
+            Sxx = sums(xc * xc)
+            ω   = sums(xc * yc) / Sxx
+            s2 = sums((yc - ω[seg] * xc)**2) / dof
+            δω = np.sqrt(s2 / Sxx)
+
+            # period in hours, as in Fitting.calculate_t0
+            t0  = (2 * np.pi / np.abs(ω)) / 3600.0
+            δt0 = ((2 * np.pi) / (ω**2)) * δω / 3600.0
+
+            tstat = (t0 - exp) / δt0
+            p = 2 * t.sf(np.abs(tstat), np.where(dof > 0, dof, np.nan))
+        p_adj = self.adjust_pvalues(p, correction)
+
+        return pd.DataFrame({
+            'Dataset':  names,
+            'n':        n,
+            't0':       t0,
+            'dt0':      δt0,
+            'Expected': exp,
+            'tstat':    tstat,
+            'dof':      dof,
+            'pvalue':   p,
+            'p_adj':    p_adj,
+            'reject':   p_adj < alpha,
+        })
+
+    # this function is used to correct p-values for multiple comparisons
+    # it takes the p-values and the method ("holm", "bonferroni", "bh"
+    # or None) as input and returns the adjusted p-values; NaN p-values
+    # (sessions too short to test) stay NaN and are not counted
+    def adjust_pvalues(self, p, method="holm"):
+        if method not in (None, "holm", "bonferroni", "bh"):
+            raise ValueError(f"unknown correction: {method}")
+        p = np.asarray(p, dtype=float)
+        out = p.copy()
+        finite = np.flatnonzero(np.isfinite(p))
+        m = len(finite)
+        if method is None or m == 0:
+            return out
+
+        order = finite[np.argsort(p[finite])]
+        ps = p[order]
+        if method == "bonferroni":
+            adj = ps * m
+        elif method == "holm":
+            adj = np.maximum.accumulate(ps * (m - np.arange(m)))
+        else:
+            adj = np.minimum.accumulate((ps * m / np.arange(1, m + 1))[::-1])[::-1]
+        out[order] = np.minimum(adj, 1.0)
+        return out
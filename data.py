@@ -1,6 +1,41 @@
 # importing libraries
+import io
+import os
+import numpy as np
 import pandas as pd
 
+# the six session files in the data folder, in the order DataStorage takes them
+CSV_FILES = (
+    "gnomon1.csv", "gnomon2.csv", "gnomon3.csv",
+    "sidereal1.csv", "sidereal2.csv", "sidereal3.csv",
+)
+
+# the datasets by name, with their time and angle attributes in DataStorage
+DATASETS = {
+    "Solar 1":    ("time1", "angle1"),
+    "Solar 2":    ("time2", "angle2"),
+    "Solar 3":    ("time3", "angle3"),
+    "Sidereal 1": ("time4", "angle4"),
+    "Sidereal 2": ("time5", "angle5"),
+    "Sidereal 3": ("time6", "angle6"),
+}
+
+# the dataset numbers used by DataStorage (data1-data6 and refresh)
+DATASET_INDEX = {
+    "Solar 1":    1,
+    "Solar 2":    2,
+    "Solar 3":    3,
+    "Sidereal 1": 4,
+    "Sidereal 2": 5,
+    "Sidereal 3": 6,
+}
+
+# the data_files function returns the paths of the six session files
+# in the data folder under base (the working directory by default)
+def data_files(base=None):
+    base = base or os.getcwd()
+    return [os.path.join(base, "data", f) for f in CSV_FILES]
+
 # declaring the DataStorage class
 # this class is used to load the data from the CSV files
 class DataStorage:
@@ -9,13 +44,20 @@ class DataStorage:
                  filename4, filename5, filename6,
                  model=None):
         # load all six CSVs via pandas
-        self.data1 = pd.read_csv(filename1)
-        self.data2 = pd.read_csv(filename2)
-        self.data3 = pd.read_csv(filename3)
-        self.data4 = pd.read_csv(filename4)
-        self.data5 = pd.read_csv(filename5)
-        self.data6 = pd.read_csv(filename6)
+        self.filenames = [filename1, filename2, filename3,
+                          filename4, filename5, filename6]
+        # byte offset read so far in every file, used by refresh
+        self.offsets = [0] * 6
+        for i in range(1, 7):
+            self._load(i)
         self.model = model
+        self.processed = False
+
+    # this function is used to read a whole CSV file
+    def _load(self, i):
+        path = self.filenames[i-1]
+        setattr(self, f"data{i}", pd.read_csv(path))
+        self.offsets[i-1] = os.path.getsize(path)
 
     # this function is used to extract the data from the CSV files
     # it extracts the time and angle data from the CSV files
@@ -59,3 +101,69 @@ class DataStorage:
         self.time4 = self.model.process_time(self.time4)
         self.time5 = self.model.process_time(self.time5)
         self.time6 = self.model.process_time(self.time6)
+        self.processed = True
+
+    # this function is used to pick up rows appended to the CSV files
+    # only the bytes after the last offset are read, and a partially
+    # written last line is left for the next refresh
+    # it returns the numbers (1-6) of the datasets that changed
+    def refresh(self):
+        changed = []
+        for i, path in enumerate(self.filenames, start=1):
+            size = os.path.getsize(path)
+            if size < self.offsets[i-1]:
+                # the file was truncated or replaced, read it again
+                self._load(i)
+                self._rebuild()
+                changed.append(i)
+                continue
+            if size == self.offsets[i-1]:
+                continue
+            with open(path, 'rb') as f:
+                f.seek(self.offsets[i-1])
+                raw = f.read(size - self.offsets[i-1])
+            cut = raw.rfind(b"\n") + 1
+            if cut == 0:
+                continue
+            self.offsets[i-1] += cut
+            old = getattr(self, f"data{i}")
+            new = pd.read_csv(io.BytesIO(raw[:cut]), header=None, names=old.columns)
+            if new.empty:
+                continue
+            setattr(self, f"data{i}", pd.concat([old, new], ignore_index=True))
+            if hasattr(self, f"time{i}"):
+                self._append(i, old.iloc[0], new)
+            changed.append(i)
+        return changed
+
+    # this function is used to extract and process every dataset again
+    def _rebuild(self):
+        self.extract_data()
+        if self.processed:
+            self.process_data()
+
+    # this function is used to extend the arrays of dataset i with new rows
+    # the first raw row is prepended so the fitting.py routines measure the
+    # new values from the same starting point as the processed ones
+    def _append(self, i, first, new):
+        def ext(attr, values):
+            setattr(self, attr, np.concatenate([getattr(self, attr), values]))
+
+        t = new['Time (s)'].to_numpy()
+        if self.processed:
+            t = self.model.process_time(np.r_[first['Time (s)'], t])[1:]
+        ext(f"time{i}", t)
+
+        if i <= 3:
+            θ = new['Angle'].to_numpy()
+            if self.processed:
+                θ = self.model.angular_dis_solar(np.r_[first['Angle'], θ])[1:]
+            ext(f"angle{i}", θ)
+        else:
+            θx = new['Angle x'].to_numpy()
+            θy = new['Angle y'].to_numpy()
+            ext(f"angle{i}x", θx)
+            ext(f"angle{i}y", θy)
+            if self.processed:
+                ext(f"angle{i}", self.model.angular_dis_sidereal(
+                    np.r_[first['Angle x'], θx], np.r_[first['Angle y'], θy])[1:])
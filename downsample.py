@@ -0,0 +1,94 @@
+# importing libraries
+import numpy as np
+
+# declaring the Downsampler class
+# this class is used to reduce large datasets to a shape-preserving subset
+# before they are handed to matplotlib, so the plots stay responsive
+class Downsampler:
+    # declaring the constructor for the Downsampler class
+    # threshold: number of points above which the data is downsampled
+    # target:    number of points kept on screen (about one per pixel column)
+    # method:    "lttb" (largest triangle three buckets) or "minmax"
+    def __init__(self, threshold=5000, target=2000, method="lttb"):
+        if method not in ("lttb", "minmax"):
+            raise ValueError(f"unknown downsampling method: {method}")
+        self.threshold = threshold
+        self.target    = target
+        self.method    = method
+
+    # this function tells if a dataset of n points should be downsampled
+    def needed(self, n):
+        return self.threshold is not None and n > max(self.threshold, self.target)
+
+    # this function is used to select the points with the LTTB algorithm
+    # it keeps the first and last point and, for every bucket in between,
+    # the point forming the largest triangle with its neighbours
+    # it takes sorted x and y arrays as input and returns the kept indices
+    def lttb(self, x, y, n_out):
+        n = len(x)
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+
+        edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+        idx = np.empty(n_out, dtype=int)
+        idx[0], idx[-1] = 0, n - 1
+
+        a = 0
+        for i in range(n_out - 2):
+            lo, hi = edges[i], edges[i + 1]
+            # average of the next bucket (or the last point)
+            if i < n_out - 3:
+                nlo, nhi = edges[i + 1], edges[i + 2]
+                cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+            else:
+                cx, cy = x[-1], y[-1]
+            ax, ay = x[a], y[a]
+            area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+            a = lo + int(np.argmax(np.where(np.isfinite(area), area, -1.0)))
+            idx[i + 1] = a
+        return idx
+
+    # this function is used to select the points with the min/max method
+    # x is split into n_buckets equal spans (one per pixel column) and the
+    # lowest and highest point of every occupied span is kept
+    # it takes x and y arrays as input and returns the kept indices
+    def minmax(self, x, y, n_buckets):
+        n = len(x)
+        if 2 * n_buckets >= n:
+            return np.arange(n)
+
+        x0, x1 = x.min(), x.max()
+        span = (x1 - x0) or 1.0
+        b = np.minimum(((x - x0) / span * n_buckets).astype(int), n_buckets - 1)
+
+        order = np.lexsort((y, b))
+        bs = b[order]
+        first = np.flatnonzero(np.r_[True, bs[1:] != bs[:-1]])
+        last  = np.r_[first[1:] - 1, n - 1]
+        return np.unique(np.r_[order[first], order[last]])
+
+    # this function is used to return the indices to plot for a dataset
+    # it returns every index when the dataset is below the threshold;
+    # points with a NaN or infinite coordinate are never selected
+    def indices(self, x, y):
+        x = np.asarray(x); y = np.asarray(y)
+        if not self.needed(len(x)):
+            return np.arange(len(x))
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            keep = np.flatnonzero(finite)
+            if not self.needed(len(keep)):
+                return keep
+            return keep[self.indices(x[keep], y[keep])]
+        if self.method == "minmax":
+            return self.minmax(x, y, self.target // 2)
+        return self.lttb(x, y, self.target)
+
+    # this function is used to reduce a pair of arrays for plotting
+    # it takes x and y as input and returns the downsampled x and y
+    def reduce(self, x, y):
+        x = np.asarray(x); y = np.asarray(y)
+        if not self.needed(len(x)):
+            return x, y
+        i = self.indices(x, y)
+        return x[i], y[i]
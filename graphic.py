@@ -1,5 +1,6 @@
 # importing libraries
 import os
+import queue
 import textwrap
 import tkinter as tk
 from tkinter import ttk
@@ -7,30 +8,34 @@ from PIL import Image, ImageTk
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.stats import t
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from data import DATASETS, DATASET_INDEX
+from downsample import Downsampler
+from store import ResultStore
+from watch import FileWatcher
 
 # declaring the Graphic class
 class Graphic(tk.Tk):
     # delcaring the constructor for the Graphic class
-    def __init__(self, storage, analysis):
+    def __init__(self, storage, analysis, downsampler=None, store=None):
         super().__init__()
         self.title("VectraLab Analysis GUI")
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self.storage  = storage
         self.analysis = analysis
+        # plots above the downsampler threshold are drawn from a reduced
+        # view of the data; saved figures are always full resolution
+        self.downsampler = downsampler or Downsampler()
+        # every result is recorded in the results database and repeated
+        # analyses of unchanged data are read back from it
+        self.store = store or ResultStore()
 
         # ─── Data mappings ─────────────────────   
         # These are the mappings for the datasets     
-        self.dataset_map = {
-            "Solar 1":    ("time1", "angle1"),
-            "Solar 2":    ("time2", "angle2"),
-            "Solar 3":    ("time3", "angle3"),
-            "Sidereal 1": ("time4", "angle4"),
-            "Sidereal 2": ("time5", "angle5"),
-            "Sidereal 3": ("time6", "angle6"),
-        }
+        self.dataset_map = dict(DATASETS)
+        # These are the dataset numbers reported by DataStorage.refresh
+        self.dataset_index = dict(DATASET_INDEX)
 
         # These are the mappings for the describe function
         self.describe_map = {
@@ -48,12 +53,22 @@ class Graphic(tk.Tk):
         self.canvas_chv = None; self.fig_chv = None
         self.canvas_t   = None; self.fig_t   = None
         self.tree_desc  = None
+        # the datasets each view was drawn from, used by live refresh
+        self._shown = {}
+
+        # ─── Live acquisition ─────────────────────────────
+        # the watcher thread reports changed files through this queue
+        self.watcher  = None
+        self._changes = queue.Queue()
 
         # initialize the GUI
         self._build_ui()
 
     # the _on_close function is called when the window is closed
     def _on_close(self):
+        if self.watcher:
+            self.watcher.stop()
+        self.store.close()
         self.quit()
         self.destroy()
 
@@ -289,6 +304,56 @@ class Graphic(tk.Tk):
         self.tree_t = ttk.Treeview(self.ttest_tab, show='headings')
         self.tree_t.pack(fill='both', expand=True)
 
+    # ─── Live acquisition ──────────────────────────────────────────
+    # the watch function starts the live acquisition mode
+    # rows appended to the CSV files are read in and the open analyses of
+    # the affected datasets are run again; debounce groups bursts of writes
+    def watch(self, interval=1.0, debounce=2.0):
+        self.watcher = FileWatcher(
+            self.storage.filenames, self._changes.put,
+            interval=interval, debounce=debounce
+        ).start()
+        self.after(200, self._poll_watch)
+
+    # the _poll_watch function checks for changes from the Tk main loop
+    def _poll_watch(self):
+        if self.watcher is None:
+            return
+        pending = False
+        while not self._changes.empty():
+            self._changes.get_nowait()
+            pending = True
+        if pending:
+            changed = self.storage.refresh()
+            if changed:
+                self._refresh_views(changed)
+        self.after(200, self._poll_watch)
+
+    # the _refresh_views function runs the shown analyses again
+    # it takes the numbers of the changed datasets as input; a view is
+    # redrawn for the datasets it shows, even if another one is selected
+    def _refresh_views(self, changed):
+        names = {n for n, i in self.dataset_index.items() if i in changed}
+        views = [
+            ('desc', self.tree_desc.get_children(), (self.combo_desc,), self._run_describe),
+            ('fit',  self.fig_fit, (self.combo_fit,),            self._run_fit),
+            ('chi',  self.fig_chi, (self.combo_a, self.combo_b), self._run_chi),
+            ('chv',  self.fig_chv, (self.combo_chv,),            self._run_chv),
+            ('t',    self.fig_t,   (self.combo_t,),              self._run_t),
+        ]
+        for view, drawn, combos, run in views:
+            shown = self._shown.get(view, ())
+            # the t-test table and its Holm correction cover every dataset
+            depends = set(self.dataset_map) if view == 't' else set(shown)
+            if not drawn or not names & depends:
+                continue
+            selected = [c.get() for c in combos]
+            for c, n in zip(combos, shown):
+                c.set(n)
+            run()
+            for c, n in zip(combos, selected):
+                c.set(n)
+
     # the _draw_canvas function is used to draw the canvas for the figures
     def _draw_canvas(self, fig, attr, parent):
         fig.tight_layout()
@@ -302,6 +367,17 @@ class Graphic(tk.Tk):
         canvas.draw()
         setattr(self, attr, canvas)
 
+    # the _save_figure function is used to write a figure to disk
+    # figures drawn from downsampled data are re-rendered at full resolution
+    # by calling plot(*args, full=True) before saving
+    def _save_figure(self, fig, png, n, plot, args):
+        if not self.downsampler.needed(n):
+            fig.savefig(png, dpi=300, bbox_inches='tight')
+            return
+        full = plot(*args, full=True)
+        full.savefig(png, dpi=300, bbox_inches='tight')
+        plt.close(full)
+
     # ─── Clear methods ─────────────────────────────────────────────
     def _clear_describe(self):
         for r in self.tree_desc.get_children():
@@ -313,6 +389,8 @@ class Graphic(tk.Tk):
             self.canvas_fit.get_tk_widget().destroy()
         self.canvas_fit = None
         self.lbl_fit.config(text="")
+        if self.fig_fit:
+            plt.close(self.fig_fit)
         self.fig_fit = None
 
     def _clear_chi(self):
@@ -323,6 +401,8 @@ class Graphic(tk.Tk):
         for r in self.tree_chi.get_children():
             self.tree_chi.delete(r)
         self.tree_chi["columns"] = []
+        if self.fig_chi:
+            plt.close(self.fig_chi)
         self.fig_chi = None
 
     def _clear_chv(self):
@@ -333,6 +413,8 @@ class Graphic(tk.Tk):
         for r in self.tree_chv.get_children():
             self.tree_chv.delete(r)
         self.tree_chv["columns"] = []
+        if self.fig_chv:
+            plt.close(self.fig_chv)
         self.fig_chv = None
 
     def _clear_t(self):
@@ -343,6 +425,8 @@ class Graphic(tk.Tk):
         for r in self.tree_t.get_children():
             self.tree_t.delete(r)
         self.tree_t["columns"] = []
+        if self.fig_t:
+            plt.close(self.fig_t)
         self.fig_t = None
 
     # ─── Describe ────────────────────────────────────────────────
@@ -353,6 +437,7 @@ class Graphic(tk.Tk):
         # 2) grab the right DataFrame
         name = self.combo_desc.get()
         df   = getattr(self.storage, self.describe_map[name])
+        self._shown['desc'] = (name,)
 
         # 3) describe → stats as rows, vars as columns
         descr = df.describe().reset_index().rename(columns={'index': 'Statistic'})
@@ -376,10 +461,19 @@ class Graphic(tk.Tk):
         x = getattr(self.storage, self.dataset_map[name][0])
         y = getattr(self.storage, self.dataset_map[name][1])
 
-        popt, perr = self.storage.model.linear_fit(x, y, yerr=None)
-        a0, a1    = popt if len(popt)==2 else (0.0, popt[0])
-        δa0, δa1  = perr if len(perr)==2 else (0.0, perr[0])
-        t0, dt0   = self.storage.model.calculate_t0(abs(a1), δa1)
+        h   = self.store.content_hash(x, y)
+        res = self.store.get(h, "fit", {"model": "linear"})
+        if res is None:
+            popt, perr = self.storage.model.linear_fit(x, y, yerr=None)
+            a0, a1    = popt if len(popt)==2 else (0.0, popt[0])
+            δa0, δa1  = perr if len(perr)==2 else (0.0, perr[0])
+            t0, dt0   = self.storage.model.calculate_t0(abs(a1), δa1)
+            res = {"intercept": a0, "intercept_err": δa0,
+                   "omega": a1, "omega_err": δa1, "t0": t0, "t0_err": dt0}
+            self.store.put(h, name, "fit", {"model": "linear"}, res)
+        a0, δa0 = res["intercept"], res["intercept_err"]
+        a1, δa1 = res["omega"], res["omega_err"]
+        t0, dt0 = res["t0"], res["t0_err"]
 
         self.lbl_fit.config(
             text=(f"Intercept = {a0:.3e} ± {δa0:.3e} rad\n"
@@ -387,33 +481,40 @@ class Graphic(tk.Tk):
                   f"t₀ = {t0:.3f} ± {dt0:.3f} hours")
         )
 
+        fig = self._plot_fit(name, x, y, a0, a1)
+        self._draw_canvas(fig, 'canvas_fit', parent=self.fit_tab)
+        self.fig_fit = fig
+        self._fit_args = (name, x, y, a0, a1)
+        self._shown['fit'] = (name,)
+
+    # This function is used to draw the fit plot
+    # the data is downsampled for display unless full is set
+    def _plot_fit(self, name, x, y, a0, a1, full=False):
+        xs, ys = (x, y) if full else self.downsampler.reduce(x, y)
         fig, ax = plt.subplots(figsize=(6,3))
         if name.startswith("Solar"):
             σ = np.radians(0.5)
-            ax.errorbar(x, y, yerr=np.full_like(x,σ), fmt='o', label='data ±0.5°')
+            ax.errorbar(xs, ys, yerr=np.full_like(xs,σ), fmt='o', label='data ±0.5°')
         else:
-            ax.scatter(x, y, s=10, label='data')
+            ax.scatter(xs, ys, s=10, label='data')
         T = np.linspace(x.min(), x.max(), 500)
         ax.plot(T, self.storage.model.linear_model(T, a0, a1),
                 '--r', label=f"θ={a0:.2e}+{a1:.2e}·t")
         ax.set_xlabel("Time (s)"); ax.set_ylabel("Δθ (rad)"); ax.legend()
-
-        self._draw_canvas(fig, 'canvas_fit', parent=self.fit_tab)
-        self.fig_fit = fig
+        return fig
 
     # This function is used to save the fit plot and the fit parameters
-    # It saves the plot as a PNG file and the parameters as a text file
+    # It saves the plot as a PNG file and commits the parameters to the results database
     def _save_fit(self):
         if not self.fig_fit:
             return
         os.makedirs('results', exist_ok=True)
         base = self.combo_fit.get().replace(' ','_')
         png  = f"results/{base}_fit.png"
-        txt  = f"results/{base}_fit.txt"
-        self.fig_fit.savefig(png, dpi=300, bbox_inches='tight')
-        with open(txt, 'w', encoding='utf-8') as f:
-            f.write(self.lbl_fit.cget('text'))
-        self.lbl_fit.config(text=f"Saved → {png} & {txt}")
+        self._save_figure(self.fig_fit, png, len(self._fit_args[1]),
+                          self._plot_fit, self._fit_args)
+        self.store.flush()
+        self.lbl_fit.config(text=f"Saved → {png} & {self.store.path}")
 
     # ─── Chi-square ───────────────────────────────────────────────
     # This function is used to run the chi-square test on two datasets
@@ -424,18 +525,19 @@ class Graphic(tk.Tk):
                             'value': getattr(self.storage, self.dataset_map[a][1])})
         df2 = pd.DataFrame({'time': getattr(self.storage, self.dataset_map[b][0]),
                             'value': getattr(self.storage, self.dataset_map[b][1])})
-        res = self.analysis.chi_square_analysis(df1, df2, bin_width=300)
-        tbl = res['table']
-
-        fig, ax = plt.subplots(figsize=(6,3))
-        ax.scatter(tbl['Time Bin'], tbl['Obs1'], label=f'Obs ({a})')
-        ax.scatter(tbl['Time Bin'], tbl['Exp1'], marker='x', label=f'Exp ({a})')
-        ax.scatter(tbl['Time Bin'], tbl['Obs2'], marker='s', label=f'Obs ({b})')
-        ax.scatter(tbl['Time Bin'], tbl['Exp2'], marker='d', label=f'Exp ({b})')
-        ax.set_xlabel('Time (s)'); ax.set_ylabel('Counts'); ax.legend()
-
+        h   = self.store.content_hash(df1['time'], df1['value'], df2['time'], df2['value'])
+        res = self.store.get(h, "chi2", {"bin_width": 300})
+        if res is None:
+            res = self.analysis.chi_square_analysis(df1, df2, bin_width=300)
+            res['table'] = {c: res['table'][c].to_numpy() for c in res['table'].columns}
+            self.store.put(h, f"{a} vs {b}", "chi2", {"bin_width": 300}, res)
+        tbl = pd.DataFrame(res['table'])
+
+        fig = self._plot_chi(a, b, tbl)
         self._draw_canvas(fig, 'canvas_chi', parent=self.chi_tab)
         self.fig_chi = fig
+        self._chi_args = (a, b, tbl)
+        self._shown['chi'] = (a, b)
 
         χ2, dof, p = res['chi2_total'], res['dof'], res['pvalue']
         concl = "correlated" if p>0.05 else "not correlated"
@@ -449,8 +551,23 @@ class Graphic(tk.Tk):
         for _, row in tbl.iterrows():
             self.tree_chi.insert('', 'end', values=[row[c] for c in cols])
 
+    # This function is used to draw the chi-square plot
+    # every series is downsampled for display unless full is set
+    def _plot_chi(self, a, b, tbl, full=False):
+        x = tbl['Time Bin'].to_numpy()
+        def series(col):
+            y = tbl[col].to_numpy()
+            return (x, y) if full else self.downsampler.reduce(x, y)
+        fig, ax = plt.subplots(figsize=(6,3))
+        ax.scatter(*series('Obs1'), label=f'Obs ({a})')
+        ax.scatter(*series('Exp1'), marker='x', label=f'Exp ({a})')
+        ax.scatter(*series('Obs2'), marker='s', label=f'Obs ({b})')
+        ax.scatter(*series('Exp2'), marker='d', label=f'Exp ({b})')
+        ax.set_xlabel('Time (s)'); ax.set_ylabel('Counts'); ax.legend()
+        return fig
+
     # This function is used to save the chi-square plot and the chi-square parameters
-    # It saves the plot as a PNG file and the parameters as a text file
+    # It saves the plot as a PNG file and commits the parameters to the results database
     def _save_chi(self):
         if not self.fig_chi:
             return
@@ -458,11 +575,10 @@ class Graphic(tk.Tk):
         a, b  = self.combo_a.get(), self.combo_b.get()
         base  = f"{a.replace(' ','_')}_vs_{b.replace(' ','_')}_chi2"
         png   = f"results/{base}.png"
-        txt   = f"results/{base}.txt"
-        self.fig_chi.savefig(png, dpi=300, bbox_inches='tight')
-        with open(txt, 'w', encoding='utf-8') as f:
-            f.write(self.lbl_chi.cget('text'))
-        self.lbl_chi.config(text=f"Saved → {png} & {txt}")
+        self._save_figure(self.fig_chi, png, len(self._chi_args[2]),
+                          self._plot_chi, self._chi_args)
+        self.store.flush()
+        self.lbl_chi.config(text=f"Saved → {png} & {self.store.path}")
 
     # ─── Chauvenet ───────────────────────────────────────────────
     # This function is used to run the Chauvenet's criterion on a dataset
@@ -472,17 +588,24 @@ class Graphic(tk.Tk):
         name = self.combo_chv.get()
         data = getattr(self.storage, self.dataset_map[name][1])
         res  = self.analysis.chauvenet(data)
-
-        vals, PNs = zip(*res)
-        fig, ax = plt.subplots(figsize=(6,3))
-        ax.scatter(vals, PNs)
-        ax.set_xlabel('Value'); ax.set_ylabel('P-Value')
-
+        vals, PNs = map(np.asarray, zip(*res))
+
+        # only the summary is stored; the per-point probabilities are
+        # cheaper to recompute than to read back for large sessions
+        h      = self.store.content_hash(data)
+        stored = self.store.get(h, "chauvenet", {"threshold": 0.5})
+        if stored is None:
+            out = [v for v,p in res if p<0.5]
+            stored = {"n": len(res), "outliers": len(out), "outlier_values": out}
+            self.store.put(h, name, "chauvenet", {"threshold": 0.5}, stored)
+
+        fig = self._plot_chv(vals, PNs)
         self._draw_canvas(fig, 'canvas_chv', parent=self.chv_tab)
         self.fig_chv = fig
+        self._chv_args = (vals, PNs)
+        self._shown['chv'] = (name,)
 
-        out = [v for v,p in res if p<0.5]
-        self.lbl_chv.config(text=f"{name}: {len(out)} outliers")
+        self.lbl_chv.config(text=f"{name}: {stored['outliers']} outliers")
 
         cols = ['Value','P-Value']
         self.tree_chv["columns"] = cols
@@ -492,45 +615,49 @@ class Graphic(tk.Tk):
         for v, pn in res:
             self.tree_chv.insert('', 'end', values=(v, pn))
 
+    # This function is used to draw the Chauvenet plot
+    # the values are downsampled for display unless full is set
+    def _plot_chv(self, vals, PNs, full=False):
+        xs, ys = (vals, PNs) if full else self.downsampler.reduce(vals, PNs)
+        fig, ax = plt.subplots(figsize=(6,3))
+        ax.scatter(xs, ys)
+        ax.set_xlabel('Value'); ax.set_ylabel('P-Value')
+        return fig
+
     # This function is used to save the Chauvenet's criterion plot and the Chauvenet's criterion parameters
-    # It saves the plot as a PNG file and the parameters as a text file
+    # It saves the plot as a PNG file and commits the parameters to the results database
     def _save_chv(self):
         if not self.fig_chv:
             return
         os.makedirs('results', exist_ok=True)
         base = f"{self.combo_chv.get().replace(' ','_')}_chauvenet"
         png  = f"results/{base}.png"
-        txt  = f"results/{base}.txt"
-        self.fig_chv.savefig(png, dpi=300, bbox_inches='tight')
-        with open(txt, 'w', encoding='utf-8') as f:
-            f.write(self.lbl_chv.cget('text'))
-        self.lbl_chv.config(text=f"Saved → {png} & {txt}")
+        self._save_figure(self.fig_chv, png, len(self._chv_args[0]),
+                          self._plot_chv, self._chv_args)
+        self.store.flush()
+        self.lbl_chv.config(text=f"Saved → {png} & {self.store.path}")
 
     # ─── T-test ───────────────────────────────────────────────
-    # This function is used to run the t-test on a dataset
-    # It compares the dataset with the expected solar or sidereal period
+    # This function is used to run the t-test on every dataset
+    # It compares each measured period with the expected solar or sidereal
+    # period and plots the selected dataset
     def _run_t(self):
         self._clear_t()
         name = self.combo_t.get()
-        x = getattr(self.storage, self.dataset_map[name][0])
-        y = getattr(self.storage, self.dataset_map[name][1])
-        popt, perr = self.storage.model.linear_fit(x, y, yerr=None)
-        a1  = popt[1] if len(popt)==2 else popt[0]
-        δa1 = perr[1] if len(perr)==2 else perr[0]
-        t0, dt0 = self.storage.model.calculate_t0(abs(a1), δa1)
-        t0_exp  = 24.0 if name.startswith("Solar") else (23 + 56/60)
-        t_stat  = (t0 - t0_exp) / dt0
-        pval    = 2 * (1 - t.cdf(abs(t_stat), df=1))
-
-        cols = ["Dataset","t₀ (h)","±δt₀","Expected","t-stat","p-value"]
+        tbl  = self._t_table()
+        row  = tbl.set_index('Dataset').loc[name]
+        t0, dt0, t0_exp = row['t0'], row['dt0'], row['Expected']
+
+        cols = ["Dataset","t₀ (h)","±δt₀","Expected","t-stat","dof","p-value","p (Holm)"]
         self.tree_t["columns"] = cols
         for c in cols:
             self.tree_t.heading(c, text=c)
-            self.tree_t.column(c, anchor='center', width=110)
-        self.tree_t.insert("", "end", values=(
-            name, f"{t0:.4f}", f"{dt0:.4f}", f"{t0_exp:.4f}",
-            f"{t_stat:.3f}", f"{pval:.3e}"
-        ))
+            self.tree_t.column(c, anchor='center', width=90)
+        for _, r in tbl.iterrows():
+            self.tree_t.insert("", "end", values=(
+                r['Dataset'], f"{r['t0']:.4f}", f"{r['dt0']:.4f}", f"{r['Expected']:.4f}",
+                f"{r['tstat']:.3f}", int(r['dof']), f"{r['pvalue']:.3e}", f"{r['p_adj']:.3e}"
+            ))
 
         fig, ax = plt.subplots(figsize=(5,3))
         ax.bar(["measured","expected"], [t0, t0_exp], yerr=[dt0,0], capsize=5)
@@ -539,24 +666,43 @@ class Graphic(tk.Tk):
 
         self._draw_canvas(fig, 'canvas_t', parent=self.ttest_tab)
         self.fig_t = fig
+        self._shown['t'] = (name,)
 
         conclusion = (
             "We are confident that the result is accurate."
-            if pval > 0.05 else
+            if row['p_adj'] > 0.05 else
             "We are not confident that the result is accurate."
         )
-        self.lbl_t.config(text=conclusion)
+        self.lbl_t.config(text=f"{name}: {conclusion}")
+
+    # This function is used to get the t-test table of all datasets
+    # the rows are read from the results database when none of the data
+    # changed, otherwise all datasets are tested again in one call
+    def _t_table(self):
+        sessions = {n: (getattr(self.storage, tx), getattr(self.storage, ay))
+                    for n, (tx, ay) in self.dataset_map.items()}
+        hashes = {n: self.store.content_hash(*xy) for n, xy in sessions.items()}
+        # the corrected p-values depend on every dataset of the family
+        family = self.store.content_hash(*[a for xy in sessions.values() for a in xy])
+        params = {"correction": "holm", "family": family}
+
+        rows = [self.store.get(hashes[n], "ttest", params) for n in sessions]
+        if all(r is not None for r in rows):
+            return pd.DataFrame(rows)
+
+        tbl = self.analysis.period_t_tests(sessions, correction="holm")
+        for r in tbl.to_dict('records'):
+            self.store.put(hashes[r['Dataset']], r['Dataset'], "ttest", params, r)
+        return tbl
 
     # This function is used to save the t-test plot and the t-test parameters
-    # It saves the plot as a PNG file and the parameters as a text file
+    # It saves the plot as a PNG file and commits the parameters to the results database
     def _save_t(self):
         if not self.fig_t:
             return
         os.makedirs('results', exist_ok=True)
         base = f"{self.combo_t.get().replace(' ','_')}_ttest"
         png  = f"results/{base}.png"
-        txt  = f"results/{base}.txt"
         self.fig_t.savefig(png, dpi=300, bbox_inches='tight')
-        with open(txt, 'w', encoding='utf-8') as f:
-            f.write(self.lbl_t.cget('text'))
-        self.lbl_t.config(text=f"Saved → {png} & {txt}")
+        self.store.flush()
+        self.lbl_t.config(text=f"Saved → {png} & {self.store.path}")
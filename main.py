@@ -1,26 +1,31 @@
 # importing libraries
 import os
-from data import DataStorage
+import argparse
+from data import DataStorage, data_files
 from fitting import Fitting
 from analysis import Analysis
 from graphic import Graphic
+from downsample import Downsampler
 
 # running the main program
 # this is the main program that runs the GUI and the analysis
 # it imports the DataStorage, Fitting, Analysis and Graphic classes
 if __name__ == "__main__":
-    base = os.getcwd()
-    ds = DataStorage(
-        os.path.join(base, "data", "gnomon1.csv"),
-        os.path.join(base, "data", "gnomon2.csv"),
-        os.path.join(base, "data", "gnomon3.csv"),
-        os.path.join(base, "data", "sidereal1.csv"),
-        os.path.join(base, "data", "sidereal2.csv"),
-        os.path.join(base, "data", "sidereal3.csv"),
-        model=Fitting()
-    )
+    parser = argparse.ArgumentParser(description="VectraLab analysis GUI")
+    parser.add_argument("--watch", action="store_true",
+                        help="refresh the analyses when rows are appended to the CSV files")
+    parser.add_argument("--debounce", type=float, default=2.0,
+                        help="seconds without writes before refreshing (default 2)")
+    parser.add_argument("--plot-threshold", type=int, default=5000,
+                        help="downsample plots with more points than this (default 5000)")
+    args = parser.parse_args()
+
+    ds = DataStorage(*data_files(os.getcwd()), model=Fitting())
     ds.extract_data()
     ds.process_data()
     analysis = Analysis()
-    app = Graphic(ds, analysis)
+    # plots above the threshold are downsampled on screen
+    app = Graphic(ds, analysis, downsampler=Downsampler(threshold=args.plot_threshold))
+    if args.watch:
+        app.watch(debounce=args.debounce)
     app.mainloop()
\ No newline at end of file
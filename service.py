@@ -0,0 +1,367 @@
+# importing libraries
+import os
+import json
+import asyncio
+import argparse
+import urllib.request
+import urllib.error
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from data import DataStorage, DATASETS, data_files
+from fitting import Fitting
+from analysis import Analysis
+
+# These are the parameters every job kind needs
+JOBS = {
+    "fit":       ("dataset",),
+    "chi2":      ("a", "b"),
+    "chauvenet": ("dataset",),
+    "ttest":     ("dataset",),
+    "ttests":    (),
+}
+
+# the data_version function returns the size and modification time of
+# every CSV file; it changes whenever rows are appended to a session
+def data_version(filenames):
+    version = []
+    for path in filenames:
+        st = os.stat(path)
+        version.append([st.st_size, st.st_mtime_ns])
+    return version
+
+# ─── Worker process ──────────────────────────────────────────────
+# every worker loads the archive once and keeps it for all of its jobs;
+# when the files change the worker reads only the appended rows
+_storage  = None
+_analysis = None
+_version  = None
+
+# the _init_worker function is called once in every worker process
+def _init_worker(filenames):
+    global _storage, _analysis, _version
+    _version = data_version(filenames)
+    _storage = DataStorage(*filenames, model=Fitting())
+    _storage.extract_data()
+    _storage.process_data()
+    _analysis = Analysis()
+
+# the _xy function returns the processed time and angle of a dataset
+def _xy(name):
+    tx, ay = DATASETS[name]
+    return getattr(_storage, tx), getattr(_storage, ay)
+
+# the _run_job function runs one analysis in a worker process
+# version is the data_version seen by the front end when the job was queued
+# it returns a JSON serializable dictionary
+def _run_job(kind, params, version=None):
+    global _version
+    if version is not None and version != _version:
+        _storage.refresh()
+        _version = version
+    model = _storage.model
+
+    if kind == "fit":
+        x, y = _xy(params["dataset"])
+        (a0, a1), (δa0, δa1) = model.linear_fit(x, y, yerr=None)
+        t0, dt0 = model.calculate_t0(abs(a1), δa1)
+        return {"intercept": float(a0), "intercept_err": float(δa0),
+                "omega": float(a1), "omega_err": float(δa1),
+                "t0": float(t0), "t0_err": float(dt0)}
+
+    if kind == "chi2":
+        xa, ya = _xy(params["a"])
+        xb, yb = _xy(params["b"])
+        res = _analysis.chi_square_analysis(
+            pd.DataFrame({'time': xa, 'value': ya}),
+            pd.DataFrame({'time': xb, 'value': yb}),
+            bin_width=params.get("bin_width", 300)
+        )
+        tbl = res['table']
+        return {"chi2_1": float(res['chi2_1']), "chi2_2": float(res['chi2_2']),
+                "chi2_total": float(res['chi2_total']), "dof": int(res['dof']),
+                "pvalue": float(res['pvalue']),
+                "table": {c: tbl[c].to_numpy().tolist() for c in tbl.columns}}
+
+    if kind == "chauvenet":
+        _, y = _xy(params["dataset"])
+        res = _analysis.chauvenet(y)
+        return {"values": [[float(v), float(p)] for v, p in res],
+                "outliers": sum(1 for _, p in res if p < 0.5)}
+
+    if kind in ("ttest", "ttests"):
+        # every dataset is tested together so the corrected p-values agree
+        tbl = _analysis.period_t_tests({n: _xy(n) for n in DATASETS},
+                                       correction=params.get("correction", "holm"))
+        rows = json.loads(tbl.to_json(orient='records', double_precision=15))
+        if kind == "ttests":
+            return {"table": rows}
+        return next(r for r in rows if r["Dataset"] == params["dataset"])
+
+    raise ValueError(f"unknown job: {kind}")
+
+
+# declaring the AnalysisService class
+# this class serves the fit, χ², Chauvenet and t-test analyses over a local
+# HTTP/JSON interface so several clients can share one archive
+#   GET  /health        → queue and cache counters
+#   GET  /datasets      → dataset names
+#   POST /jobs/<kind>   → run a job, the JSON body holds its parameters
+# requests go through a bounded queue to a pool of worker processes;
+# identical requests in flight share one job and completed ones are cached;
+# the cache key includes the size and mtime of the CSV files, so rows
+# appended while observing are picked up by the next request
+class AnalysisService:
+    # declaring the constructor for the AnalysisService class
+    def __init__(self, filenames,
+                 host="127.0.0.1", port=8765,
+                 workers=None, queue_size=64, cache_size=256):
+        self.filenames  = list(filenames)
+        self.host       = host
+        self.port       = port
+        self.workers    = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.cache_size = cache_size
+
+        self._cache    = OrderedDict()
+        self._inflight = {}
+        self._queue    = None
+        self._pool     = None
+        self._server   = None
+        self._tasks    = []
+        self.stats     = {"jobs": 0, "cache_hits": 0, "deduplicated": 0, "rejected": 0}
+
+    # the start function starts the worker pool and the HTTP server
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._pool  = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.filenames,)
+        )
+        self._tasks = [asyncio.create_task(self._dispatch())
+                       for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # port 0 picks a free port, report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    # the stop function shuts down the server, the dispatchers and the pool
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # jobs still queued will never run
+        while self._queue is not None and not self._queue.empty():
+            key, _, _, _, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError("the service stopped"))
+            self._inflight.pop(key, None)
+        if self._pool:
+            self._pool.shutdown(cancel_futures=True)
+        self._server, self._tasks, self._pool = None, [], None
+
+    # the serve_forever function runs the service until interrupted
+    async def serve_forever(self):
+        await self.start()
+        print(f"[Service] listening on http://{self.host}:{self.port}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # ─── Jobs ───────────────────────────────────────────────────
+    # the submit function returns the result of a job
+    # it answers from the cache, joins an identical job in flight,
+    # or queues a new job; it raises asyncio.QueueFull when the queue is full
+    async def submit(self, kind, params):
+        self._validate(kind, params)
+        if kind == "chi2":
+            params = {"bin_width": 300, **params}
+        version = data_version(self.filenames)
+        key = json.dumps([kind, params, version], sort_keys=True)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return self._cache[key]
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.stats["deduplicated"] += 1
+            return await asyncio.shield(fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((key, kind, params, version, fut))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise
+        self._inflight[key] = fut
+        self.stats["jobs"] += 1
+        return await asyncio.shield(fut)
+
+    # the _validate function checks the job kind and its parameters
+    def _validate(self, kind, params):
+        if kind not in JOBS:
+            raise ValueError(f"unknown job: {kind}")
+        if not isinstance(params, dict):
+            raise ValueError("parameters must be a JSON object")
+        for p in JOBS[kind]:
+            if params.get(p) not in DATASETS:
+                raise ValueError(f"{p}: unknown dataset {params.get(p)!r}")
+        if params.get("correction", "holm") not in ("holm", "bonferroni", "bh", None):
+            raise ValueError(f"unknown correction: {params['correction']}")
+        if "bin_width" in params:
+            bw = params["bin_width"]
+            if isinstance(bw, bool) or not isinstance(bw, (int, float)) or bw <= 0:
+                raise ValueError("bin_width must be a positive number")
+
+    # the _dispatch function moves jobs from the queue to the worker pool
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, kind, params, version, fut = await self._queue.get()
+            try:
+                res = await loop.run_in_executor(self._pool, _run_job,
+                                                 kind, params, version)
+            except asyncio.CancelledError:
+                # the service is stopping, release the callers waiting on it
+                if not fut.done():
+                    fut.set_exception(RuntimeError("the service stopped"))
+                raise
+            except Exception as e:
+                fut.set_exception(e)
+            else:
+                self._cache[key] = res
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                fut.set_result(res)
+            finally:
+                self._inflight.pop(key, None)
+                self._queue.task_done()
+
+    # ─── HTTP ───────────────────────────────────────────────────
+    # the _handle function answers one HTTP request
+    async def _handle(self, reader, writer):
+        try:
+            status, body = await self._route(reader)
+        except Exception as e:
+            status, body = 400, {"error": f"bad request: {e}"}
+        data = json.dumps(body).encode('utf-8')
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                  500: "Internal Server Error", 503: "Service Unavailable"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode('ascii') + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    # the _route function parses the request and returns (status, body)
+    async def _route(self, reader):
+        line = (await reader.readline()).decode('ascii').split()
+        if len(line) < 2:
+            return 400, {"error": "bad request line"}
+        method, path = line[0], line[1]
+
+        headers = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = h.decode('latin-1').partition(":")
+            headers[k.strip().lower()] = v.strip()
+        n = int(headers.get("content-length", 0))
+        raw = await reader.readexactly(n) if n else b""
+
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "queued": self._queue.qsize(),
+                         "in_flight": len(self._inflight),
+                         "cached": len(self._cache), **self.stats}
+        if method == "GET" and path == "/datasets":
+            return 200, {"datasets": list(DATASETS)}
+        if method == "POST" and path.startswith("/jobs/"):
+            params = json.loads(raw or b"{}")
+            try:
+                res = await self.submit(path[len("/jobs/"):], params)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            except asyncio.QueueFull:
+                return 503, {"error": "job queue is full, retry later"}
+            except Exception as e:
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+            return 200, res
+        return 404, {"error": f"no route for {method} {path}"}
+
+
+# declaring the AnalysisClient class
+# this class is a small blocking client for the AnalysisService
+class AnalysisClient:
+    # declaring the constructor for the AnalysisClient class
+    def __init__(self, url="http://127.0.0.1:8765", timeout=60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    # the _request function sends a request and returns the decoded JSON
+    # it raises RuntimeError with the server message on an error status
+    def _request(self, path, params=None):
+        data = None if params is None else json.dumps(params).encode('utf-8')
+        req = urllib.request.Request(
+            self.url + path, data=data,
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as r:
+                return json.loads(r.read())
+        except urllib.error.HTTPError as e:
+            msg = json.loads(e.read() or b"{}").get("error", e.reason)
+            raise RuntimeError(f"{e.code}: {msg}") from None
+
+    def health(self):
+        return self._request("/health")
+
+    def datasets(self):
+        return self._request("/datasets")["datasets"]
+
+    def run(self, kind, **params):
+        return self._request(f"/jobs/{kind}", params)
+
+    def fit(self, dataset):
+        return self.run("fit", dataset=dataset)
+
+    def chi2(self, a, b, bin_width=300):
+        return self.run("chi2", a=a, b=b, bin_width=bin_width)
+
+    def chauvenet(self, dataset):
+        return self.run("chauvenet", dataset=dataset)
+
+    def ttest(self, dataset, correction="holm"):
+        return self.run("ttest", dataset=dataset, correction=correction)
+
+    def ttests(self, correction="holm"):
+        return self.run("ttests", correction=correction)["table"]
+
+
+# running the analysis service
+# it serves the six CSVs from the data folder like main.py does
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VectraLab local analysis service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=64)
+    args = parser.parse_args()
+
+    service = AnalysisService(data_files(os.getcwd()), host=args.host, port=args.port,
+                              workers=args.workers, queue_size=args.queue_size)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
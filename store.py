@@ -0,0 +1,159 @@
+# importing libraries
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# the schema of the results database
+# every analysis run is one row in results, identified by the content hash
+# of its input data, the analysis name and its parameters; its scalar
+# values (t₀, p-value, χ², ...) are also written to metrics so they can be
+# queried across sessions without decoding the JSON
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id           INTEGER PRIMARY KEY,
+    dataset_hash TEXT NOT NULL,
+    dataset      TEXT NOT NULL,
+    analysis     TEXT NOT NULL,
+    params       TEXT NOT NULL,
+    created      REAL NOT NULL,
+    result       TEXT NOT NULL,
+    UNIQUE (dataset_hash, analysis, params)
+);
+CREATE INDEX IF NOT EXISTS idx_results_created ON results (analysis, created);
+CREATE TABLE IF NOT EXISTS metrics (
+    result_id INTEGER NOT NULL REFERENCES results (id) ON DELETE CASCADE,
+    name      TEXT NOT NULL,
+    value     REAL,
+    PRIMARY KEY (result_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics (name, value);
+"""
+
+# the _to_json function converts numpy values so results can be stored
+def _to_json(o):
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, np.generic):
+        return o.item()
+    raise TypeError(f"cannot store {type(o).__name__}")
+
+# the _timestamp function converts a datetime or a number to unix time
+# naive datetimes are read as local time, like the created column
+def _timestamp(t):
+    return t.timestamp() if isinstance(t, datetime) else float(t)
+
+# declaring the ResultStore class
+# this class is used to store the analysis results in a local SQLite database
+class ResultStore:
+    # declaring the constructor for the ResultStore class
+    # writes are kept in memory and committed batch_size at a time
+    def __init__(self, path=os.path.join("results", "results.db"), batch_size=64):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = {}
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(SCHEMA)
+
+    # this function is used to hash the content of a dataset
+    # it takes one or more arrays as input and returns a hex digest
+    @staticmethod
+    def content_hash(*arrays):
+        h = hashlib.sha256()
+        for a in arrays:
+            a = np.ascontiguousarray(a, dtype=float)
+            h.update(str(a.shape).encode('ascii'))
+            h.update(a.tobytes())
+        return h.hexdigest()
+
+    # the _key function returns the lookup key of a result
+    @staticmethod
+    def _key(dataset_hash, analysis, params):
+        return (dataset_hash, analysis,
+                json.dumps(params or {}, sort_keys=True, default=_to_json))
+
+    # this function is used to look up a stored result
+    # it returns the result dictionary or None if it was never computed
+    def get(self, dataset_hash, analysis, params=None):
+        key = self._key(dataset_hash, analysis, params)
+        if key in self._pending:
+            return json.loads(self._pending[key][1])
+        row = self._conn.execute(
+            "SELECT result FROM results "
+            "WHERE dataset_hash = ? AND analysis = ? AND params = ?", key
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    # this function is used to store a result
+    # the row is written with the next batch, see flush
+    def put(self, dataset_hash, dataset, analysis, params, result):
+        key = self._key(dataset_hash, analysis, params)
+        self._pending[key] = (dataset, json.dumps(result, default=_to_json), time.time())
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    # this function is used to write the pending results in one transaction
+    # a result with the same key replaces the stored one
+    def flush(self):
+        if not self._pending:
+            return
+        with self._conn:
+            for (h, analysis, params), (dataset, result, created) in self._pending.items():
+                self._conn.execute(
+                    "DELETE FROM results "
+                    "WHERE dataset_hash = ? AND analysis = ? AND params = ?",
+                    (h, analysis, params)
+                )
+                rid = self._conn.execute(
+                    "INSERT INTO results "
+                    "(dataset_hash, dataset, analysis, params, created, result) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (h, dataset, analysis, params, created, result)
+                ).lastrowid
+                values = json.loads(result)
+                self._conn.executemany(
+                    "INSERT INTO metrics (result_id, name, value) VALUES (?, ?, ?)",
+                    [(rid, k, float(v)) for k, v in values.items()
+                     if isinstance(v, (int, float)) and not isinstance(v, bool)]
+                )
+        self._pending.clear()
+
+    # this function is used to query a metric across sessions
+    # e.g. query("fit", "t0", since=datetime(2026, 10, 1))
+    # since/until and the returned created column are in local time
+    # it returns a DataFrame with one row per stored result
+    def query(self, analysis=None, metric=None, since=None, until=None, dataset=None):
+        self.flush()
+        sql = ("SELECT r.created, r.dataset, r.analysis, r.params, "
+               "m.name AS metric, m.value "
+               "FROM results r JOIN metrics m ON m.result_id = r.id WHERE 1 = 1")
+        args = []
+        if analysis is not None:
+            sql += " AND r.analysis = ?"; args.append(analysis)
+        if metric is not None:
+            sql += " AND m.name = ?"; args.append(metric)
+        if since is not None:
+            sql += " AND r.created >= ?"; args.append(_timestamp(since))
+        if until is not None:
+            sql += " AND r.created < ?"; args.append(_timestamp(until))
+        if dataset is not None:
+            sql += " AND r.dataset = ?"; args.append(dataset)
+        df = pd.read_sql_query(sql + " ORDER BY r.created", self._conn, params=args)
+        df['created'] = pd.to_datetime([datetime.fromtimestamp(t) for t in df['created']])
+        return df
+
+    # this function is used to write the pending results and close the database
+    def close(self):
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
@@ -0,0 +1,12 @@
+# importing libraries
+import os
+import sys
+
+# the modules live at the top of the repository
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data import data_files
+
+# the six session CSVs shipped in the data folder
+DATA_FILES = data_files(ROOT)
@@ -0,0 +1,134 @@
+# importing libraries
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2, t
+from conftest import DATA_FILES
+from analysis import Analysis, SOLAR_DAY, SIDEREAL_DAY
+from data import DataStorage, DATASETS
+from fitting import Fitting
+
+# the reference function is the pandas χ² binning that the sorted-merge
+# kernel replaced
+def reference_chi_square(df1, df2, bin_width):
+    def bin_data(df):
+        b = ((df['time'] // bin_width) * bin_width).astype(int)
+        return df.groupby(b)['value'].sum()
+
+    b1 = bin_data(df1)
+    b2 = bin_data(df2)
+    all_bins = b1.index.union(b2.index)
+    b1 = b1.reindex(all_bins, fill_value=0)
+    b2 = b2.reindex(all_bins, fill_value=0)
+
+    T1, T2 = b1.sum(), b2.sum()
+    Tot = T1 + T2
+    E1 = (b1 + b2) * (T1 / Tot)
+    E2 = (b1 + b2) * (T2 / Tot)
+    χ2_1 = ((b1 - E1)**2 / E1).replace([np.inf, np.nan], 0).sum()
+    χ2_2 = ((b2 - E2)**2 / E2).replace([np.inf, np.nan], 0).sum()
+    ν = len(all_bins) - 1
+    table = pd.DataFrame({'Time Bin': all_bins, 'Obs1': b1.values, 'Obs2': b2.values,
+                          'Exp1': E1.values, 'Exp2': E2.values})
+    return {'table': table, 'chi2_1': χ2_1, 'chi2_2': χ2_2,
+            'chi2_total': χ2_1 + χ2_2, 'dof': ν, 'pvalue': 1 - chi2.cdf(χ2_1 + χ2_2, ν)}
+
+# the random_series function returns an unsorted series that may start
+# at negative or absolute (unix) times
+def random_series(rng):
+    n = int(rng.integers(1, 300))
+    start = rng.choice([0.0, -5e4, 1.7e9]) + rng.uniform(-1e3, 1e3)
+    time = start + rng.uniform(0, rng.choice([600.0, 86400.0, 5 * 86400.0]), n)
+    return pd.DataFrame({'time': time, 'value': rng.uniform(0, 3, n)})
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_chi_square_matches_pandas_binning(seed):
+    rng = np.random.default_rng(seed)
+    df1, df2 = random_series(rng), random_series(rng)
+    bin_width = float(rng.choice([300, 60, 0.75, 12.5, rng.uniform(0.1, 900)]))
+
+    got = Analysis().chi_square_analysis(df1, df2, bin_width=bin_width)
+    ref = reference_chi_square(df1, df2, bin_width)
+
+    assert list(got['table'].columns) == list(ref['table'].columns)
+    for c in ref['table'].columns:
+        np.testing.assert_allclose(got['table'][c].to_numpy(),
+                                   ref['table'][c].to_numpy(), rtol=1e-9)
+    assert got['dof'] == ref['dof']
+    for k in ('chi2_1', 'chi2_2', 'chi2_total', 'pvalue'):
+        assert got[k] == pytest.approx(ref[k], rel=1e-9, abs=1e-12)
+
+def test_bin_sorted_only_touches_occupied_bins():
+    time = np.array([1.7e9 + 5, 10.0, 1.7e9, 20.0])
+    bins, sums = Analysis().bin_sorted(time, np.ones(4), 300)
+    assert bins.tolist() == [0, 1699999800]
+    assert sums.tolist() == [2.0, 2.0]
+
+
+# ─── period t-tests ─────────────────────────────────────────────
+@pytest.fixture(scope="module")
+def sessions():
+    ds = DataStorage(*DATA_FILES, model=Fitting())
+    ds.extract_data()
+    ds.process_data()
+    return ds, {n: (getattr(ds, tx), getattr(ds, ay)) for n, (tx, ay) in DATASETS.items()}
+
+def test_period_matches_curve_fit(sessions):
+    ds, data = sessions
+    tbl = Analysis().period_t_tests(data).set_index('Dataset')
+    for name, (x, y) in data.items():
+        popt, perr = ds.model.linear_fit(x, y, yerr=None)
+        t0, dt0 = ds.model.calculate_t0(abs(popt[1]), perr[1])
+        assert tbl.loc[name, 't0'] == pytest.approx(t0, rel=1e-6)
+        assert tbl.loc[name, 'dt0'] == pytest.approx(dt0, rel=1e-4)
+    assert tbl.loc['Solar 1', 't0'] == pytest.approx(24.3048, abs=1e-4)
+    assert tbl.loc['Solar 1', 'dt0'] == pytest.approx(0.4185, abs=1e-4)
+
+def test_pvalue_uses_n_minus_2_dof(sessions):
+    _, data = sessions
+    tbl = Analysis().period_t_tests(data, correction=None)
+    for _, r in tbl.iterrows():
+        expected = SOLAR_DAY if r['Dataset'].startswith("Solar") else SIDEREAL_DAY
+        assert r['Expected'] == expected
+        assert r['dof'] == r['n'] - 2
+        assert r['tstat'] == pytest.approx((r['t0'] - expected) / r['dt0'])
+        assert r['pvalue'] == pytest.approx(2 * t.sf(abs(r['tstat']), r['n'] - 2))
+        assert r['p_adj'] == r['pvalue']
+
+def test_short_sessions_do_not_spoil_the_others(sessions):
+    _, data = sessions
+    data = dict(data)
+    data['Solar 1'] = (data['Solar 1'][0][:2], data['Solar 1'][1][:2])
+    data['Solar 2'] = (data['Solar 2'][0][:0], data['Solar 2'][1][:0])
+    tbl = Analysis().period_t_tests(data, correction="bh").set_index('Dataset')
+    assert np.isnan(tbl.loc[['Solar 1', 'Solar 2'], 'p_adj']).all()
+    rest = tbl.drop(['Solar 1', 'Solar 2'])
+    assert np.isfinite(rest['p_adj']).all()
+    np.testing.assert_allclose(rest['p_adj'],
+                               Analysis().adjust_pvalues(rest['pvalue'], "bh"))
+
+@pytest.mark.parametrize("method, expected", [
+    (None,         [0.01, 0.04, 0.03, 0.5]),
+    ("bonferroni", [0.04, 0.16, 0.12, 1.0]),
+    # sorted 0.01, 0.03, 0.04, 0.5 → 4·0.01, 3·0.03, max(2·0.04, 0.09), 1·0.5
+    ("holm",       [0.04, 0.09, 0.09, 0.5]),
+    # sorted 0.01, 0.03, 0.04, 0.5 → min over the tail of 4·p/rank
+    ("bh",         [0.04, 0.05333333, 0.05333333, 0.5]),
+])
+def test_adjust_pvalues(method, expected):
+    got = Analysis().adjust_pvalues([0.01, 0.04, 0.03, 0.5], method)
+    np.testing.assert_allclose(got, expected)
+
+@pytest.mark.parametrize("method, expected", [
+    ("bonferroni", [0.03, 0.06, np.nan, 0.12]),
+    ("holm",       [0.03, 0.04, np.nan, 0.04]),
+    ("bh",         [0.03, 0.03, np.nan, 0.04]),
+])
+def test_adjust_pvalues_leaves_nan_out(method, expected):
+    got = Analysis().adjust_pvalues([0.01, 0.02, np.nan, 0.04], method)
+    np.testing.assert_allclose(got, expected)
+
+def test_adjust_pvalues_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        Analysis().adjust_pvalues([0.1], "sidak")
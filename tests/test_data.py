@@ -0,0 +1,77 @@
+# importing libraries
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import DATA_FILES
+from data import DataStorage
+from fitting import Fitting
+
+# the arrays a processed DataStorage exposes
+ARRAYS = ["time1", "time2", "time3", "time4", "time5", "time6",
+          "angle1", "angle2", "angle3", "angle4", "angle5", "angle6",
+          "angle4x", "angle4y", "angle5x", "angle5y", "angle6x", "angle6y"]
+
+@pytest.fixture
+def files(tmp_path):
+    return [str(shutil.copy(f, tmp_path)) for f in DATA_FILES]
+
+# the load function returns a DataStorage read from files
+def load(files, process=True):
+    ds = DataStorage(*files, model=Fitting())
+    ds.extract_data()
+    if process:
+        ds.process_data()
+    return ds
+
+# the assert_same function checks that two storages hold the same data
+def assert_same(ds, ref, arrays=ARRAYS):
+    for a in arrays:
+        np.testing.assert_allclose(getattr(ds, a), getattr(ref, a), err_msg=a)
+    for i in range(1, 7):
+        pd.testing.assert_frame_equal(getattr(ds, f"data{i}"), getattr(ref, f"data{i}"))
+
+
+def test_refresh_without_changes(files):
+    assert load(files).refresh() == []
+
+def test_refresh_reads_appended_rows(files):
+    ds = load(files)
+    with open(files[0], "a") as f:
+        f.write("16:00:00,57600,300,1.0\n16:05:00,57900,299,1.1\n")
+    with open(files[3], "a") as f:
+        f.write("23:50:00,85800,10,320\n")
+    assert ds.refresh() == [1, 4]
+    assert_same(ds, load(files))
+    assert ds.refresh() == []
+
+def test_refresh_before_processing(files):
+    ds = load(files, process=False)
+    with open(files[4], "a") as f:
+        f.write("23:50:00,85800,10,320\n")
+    assert ds.refresh() == [5]
+    raw = [a for a in ARRAYS if a.endswith(("x", "y")) or a.startswith("time")]
+    assert_same(ds, load(files, process=False), raw)
+
+def test_partial_line_waits_until_completed(files):
+    ds = load(files)
+    n = len(ds.time1)
+    with open(files[0], "a") as f:
+        f.write("16:00:00,57600,30")
+    assert ds.refresh() == []
+    assert len(ds.time1) == n
+    with open(files[0], "a") as f:
+        f.write("0,1.0\n")
+    assert ds.refresh() == [1]
+    assert len(ds.time1) == n + 1
+    assert_same(ds, load(files))
+
+def test_truncated_file_is_read_again(files):
+    ds = load(files)
+    with open(files[2]) as f:
+        head = f.readlines()[:6]
+    with open(files[2], "w") as f:
+        f.writelines(head)
+    assert ds.refresh() == [3]
+    assert len(ds.data3) == 5
+    assert_same(ds, load(files))
@@ -0,0 +1,64 @@
+# importing libraries
+import numpy as np
+import pytest
+from downsample import Downsampler
+
+
+def test_lttb_keeps_ends_spike_and_order():
+    rng = np.random.default_rng(0)
+    x = np.arange(100_000, dtype=float)
+    y = np.sin(x / 5e3) + rng.uniform(0, 0.01, len(x))
+    y[43_210] = 25.0
+    idx = Downsampler(threshold=1000, target=500).lttb(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 43_210 in idx
+
+def test_lttb_short_input_is_unchanged():
+    x = np.arange(10.0)
+    assert Downsampler().lttb(x, x, 20).tolist() == list(range(10))
+
+def test_minmax_keeps_bucket_extremes():
+    rng = np.random.default_rng(1)
+    x = np.sort(rng.uniform(0, 1000, 20_000))
+    y = rng.normal(size=len(x))
+    n_buckets = 50
+    idx = Downsampler(method="minmax").minmax(x, y, n_buckets)
+    assert np.all(np.diff(idx) > 0)
+    b = np.minimum((x / (x.max() - x.min()) * n_buckets).astype(int), n_buckets - 1)
+    kept = set(idx.tolist())
+    for k in range(n_buckets):
+        members = np.flatnonzero(b == k)
+        assert members[np.argmin(y[members])] in kept
+        assert members[np.argmax(y[members])] in kept
+    assert len(idx) <= 2 * n_buckets
+
+@pytest.mark.parametrize("threshold, target, n, expected", [
+    (100, 50, 100, False),
+    (100, 50, 101, True),
+    (10, 50, 50, False),
+    (10, 50, 51, True),
+    (None, 50, 10**6, False),
+])
+def test_needed_around_threshold_and_target(threshold, target, n, expected):
+    assert Downsampler(threshold=threshold, target=target).needed(n) is expected
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_reduce_skips_non_finite_points(method):
+    rng = np.random.default_rng(2)
+    x = np.arange(200_000, dtype=float)
+    y = rng.random(len(x))
+    y[rng.choice(len(x), 200, replace=False)] = np.nan
+    xs, ys = Downsampler(threshold=5000, target=2000, method=method).reduce(x, y)
+    assert 0 < len(xs) <= 2000
+    assert np.isfinite(ys).all()
+
+def test_reduce_below_threshold_returns_input():
+    x = np.arange(50.0)
+    xs, ys = Downsampler(threshold=100).reduce(x, -x)
+    assert xs is not None and len(xs) == 50 and ys[-1] == -49.0
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        Downsampler(method="mean")
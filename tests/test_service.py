@@ -0,0 +1,136 @@
+# importing libraries
+import time
+import asyncio
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import DATA_FILES
+from service import AnalysisService, AnalysisClient
+
+# the running function starts a service on a free port in a background
+# event loop and returns (service, loop, client)
+def running(files, **kwargs):
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    svc = AnalysisService(files, port=0, **kwargs)
+    asyncio.run_coroutine_threadsafe(svc.start(), loop).result(60)
+    return svc, loop, AnalysisClient(f"http://127.0.0.1:{svc.port}")
+
+# the shutdown function stops a service started by running
+def shutdown(svc, loop):
+    asyncio.run_coroutine_threadsafe(svc.stop(), loop).result(60)
+    loop.call_soon_threadsafe(loop.stop)
+
+@pytest.fixture(scope="module")
+def service():
+    svc, loop, client = running(DATA_FILES, workers=2)
+    yield svc, loop, client
+    shutdown(svc, loop)
+
+
+def test_datasets_and_health(service):
+    _, _, client = service
+    assert "Solar 1" in client.datasets()
+    assert client.health()["status"] == "ok"
+
+def test_fit(service):
+    _, _, client = service
+    res = client.fit("Solar 1")
+    assert res["t0"] == pytest.approx(24.305, abs=1e-3)
+    assert res["t0_err"] == pytest.approx(0.419, abs=1e-3)
+
+def test_chi2(service):
+    _, _, client = service
+    res = client.chi2("Solar 1", "Sidereal 1", bin_width=300)
+    assert res["dof"] == len(res["table"]["Time Bin"]) - 1
+    assert 0 <= res["pvalue"] <= 1
+
+def test_ttest_rows_agree_with_table(service):
+    _, _, client = service
+    table = client.ttests()
+    assert len(table) == 6
+    row = client.ttest("Sidereal 2")
+    assert row == next(r for r in table if r["Dataset"] == "Sidereal 2")
+    assert row["dof"] == row["n"] - 2
+
+def test_identical_requests_share_one_job(service):
+    svc, _, client = service
+    before = dict(svc.stats)
+    with ThreadPoolExecutor(5) as pool:
+        results = list(pool.map(lambda _: client.chauvenet("Solar 2"), range(5)))
+    assert all(r == results[0] for r in results)
+    assert svc.stats["jobs"] - before["jobs"] == 1
+    shared = (svc.stats["deduplicated"] - before["deduplicated"]
+              + svc.stats["cache_hits"] - before["cache_hits"])
+    assert shared == 4
+
+def test_bad_input_is_400(service):
+    _, _, client = service
+    with pytest.raises(RuntimeError, match="^400"):
+        client.fit("Lunar 1")
+    with pytest.raises(RuntimeError, match="^400"):
+        client.run("nope", dataset="Solar 1")
+    with pytest.raises(RuntimeError, match="^400"):
+        client.chi2("Solar 1", "Solar 2", bin_width=-1)
+
+# the wait_for_health function polls /health until ready(health) is true
+def wait_for_health(client, ready, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if ready(client.health()):
+            return
+        time.sleep(0.005)
+    raise AssertionError("the service never reached the expected state")
+
+def test_full_queue_is_503(tmp_path):
+    # a long "Solar 1" session keeps the only worker busy for a while
+    files = [str(shutil.copy(f, tmp_path)) for f in DATA_FILES]
+    n = 1_000_000
+    t = 33420 + 15 * np.arange(n)
+    θ = 351 - 0.004 * np.arange(n) % 360
+    pd.DataFrame({'Time': "9:17:00", 'Time (s)': t, 'Angle': θ, 'Length': 3.0}
+                 ).to_csv(files[0], index=False)
+
+    svc, loop, client = running(files, workers=1, queue_size=1)
+    try:
+        with ThreadPoolExecutor(2) as pool:
+            slow = pool.submit(client.fit, "Solar 1")
+            wait_for_health(client, lambda h: h["in_flight"] == 1 and h["queued"] == 0)
+            queued = pool.submit(client.fit, "Solar 2")
+            wait_for_health(client, lambda h: h["queued"] == 1)
+            with pytest.raises(RuntimeError, match="^503"):
+                client.fit("Solar 3")
+            assert slow.result(60)["t0"] > 0
+            assert queued.result(60)["t0"] > 0
+        assert client.health()["rejected"] == 1
+    finally:
+        shutdown(svc, loop)
+
+def test_appended_rows_reach_clients(tmp_path):
+    files = []
+    for f in DATA_FILES:
+        files.append(str(shutil.copy(f, tmp_path)))
+    svc, loop, client = running(files, workers=1)
+    try:
+        n = client.ttest("Solar 1")["n"]
+        assert client.ttest("Solar 1")["n"] == n
+        with open(files[0], "a") as f:
+            f.write("16:00:00,57600,300,1.0\n16:05:00,57900,299,1.1\n")
+        assert client.ttest("Solar 1")["n"] == n + 2
+    finally:
+        shutdown(svc, loop)
+
+def test_stop_releases_waiting_callers():
+    async def scenario():
+        svc = AnalysisService(DATA_FILES, port=0, workers=1, queue_size=4)
+        await svc.start()
+        jobs = [asyncio.create_task(svc.submit("fit", {"dataset": n}))
+                for n in ("Solar 1", "Solar 2", "Solar 3")]
+        await asyncio.sleep(0)
+        await svc.stop()
+        return await asyncio.wait_for(asyncio.gather(*jobs, return_exceptions=True), 10)
+    res = asyncio.run(scenario())
+    assert all(isinstance(r, (dict, RuntimeError)) for r in res)
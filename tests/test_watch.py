@@ -0,0 +1,66 @@
+# importing libraries
+import time
+import threading
+import pytest
+from watch import FileWatcher
+
+# the Recorder class collects the callbacks of a FileWatcher
+class Recorder:
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def __call__(self, paths):
+        self.calls.append(set(paths))
+        self.event.set()
+
+@pytest.fixture
+def csv(tmp_path):
+    path = tmp_path / "session.csv"
+    path.write_text("Time,Time (s),Angle,Length\n")
+    return path
+
+# the append function adds one row to a CSV file
+def append(path, row):
+    with open(path, "a") as f:
+        f.write(row + "\n")
+
+
+def test_burst_of_writes_is_one_callback(csv):
+    rec = Recorder()
+    w = FileWatcher([csv], rec, interval=0.02, debounce=0.3, use_inotify=False).start()
+    try:
+        for k in range(5):
+            append(csv, f"9:{k:02d}:00,{33420 + 60 * k},351,3.2")
+            time.sleep(0.05)
+        assert rec.event.wait(5)
+        time.sleep(0.5)
+        assert rec.calls == [{str(csv)}]
+
+        rec.event.clear()
+        append(csv, "9:10:00,34020,350,3.1")
+        assert rec.event.wait(5)
+        assert len(rec.calls) == 2
+    finally:
+        w.stop()
+
+def test_no_callback_without_writes(csv):
+    rec = Recorder()
+    w = FileWatcher([csv], rec, interval=0.02, debounce=0.05, use_inotify=False).start()
+    try:
+        time.sleep(0.3)
+        assert rec.calls == []
+    finally:
+        w.stop()
+
+def test_only_changed_files_are_reported(tmp_path, csv):
+    other = tmp_path / "other.csv"
+    other.write_text("Time,Time (s),Angle,Length\n")
+    rec = Recorder()
+    w = FileWatcher([csv, other], rec, interval=0.02, debounce=0.1, use_inotify=False).start()
+    try:
+        append(other, "9:00:00,32400,351,3.2")
+        assert rec.event.wait(5)
+        assert rec.calls == [{str(other)}]
+    finally:
+        w.stop()
@@ -0,0 +1,89 @@
+# importing libraries
+import os
+import time
+import threading
+
+# inotify is used when the optional inotify_simple package is installed,
+# otherwise the files are polled
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+# declaring the FileWatcher class
+# this class is used to detect writes to a set of files in a background thread
+# a burst of writes is reported once, after the files have been quiet
+# for debounce seconds; callback receives the set of changed paths
+class FileWatcher:
+    # declaring the constructor for the FileWatcher class
+    def __init__(self, paths, callback, interval=1.0, debounce=2.0, use_inotify=True):
+        self.paths    = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self._stop    = threading.Event()
+        self._thread  = None
+        self._inotify = None
+        if use_inotify and INotify is not None:
+            self._inotify = INotify()
+            self._wds = {
+                self._inotify.add_watch(p, flags.MODIFY | flags.CLOSE_WRITE): p
+                for p in self.paths
+            }
+        self._stats = {p: self._stat(p) for p in self.paths}
+
+    # the _stat function returns the size and modification time of a file
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    # the start function starts watching in a daemon thread
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    # the stop function stops watching and waits for the thread
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    # the _wait function waits up to one interval and returns the changed paths
+    def _wait(self):
+        if self._inotify is not None:
+            events = self._inotify.read(timeout=int(self.interval * 1000))
+            return {self._wds[e.wd] for e in events if e.wd in self._wds}
+        self._stop.wait(self.interval)
+        changed = set()
+        for p in self.paths:
+            st = self._stat(p)
+            if st != self._stats[p]:
+                self._stats[p] = st
+                changed.add(p)
+        return changed
+
+    # the _run function collects changes and calls back once a burst is over
+    def _run(self):
+        pending, last = set(), 0.0
+        while not self._stop.is_set():
+            changed = self._wait()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last = now
+            if pending and now - last >= self.debounce:
+                try:
+                    self.callback(pending)
+                except Exception as e:
+                    print(f"[FileWatcher] refresh failed: {e}")
+                pending = set()